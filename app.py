@@ -1,16 +1,26 @@
 import streamlit as st
 import random
+import json
+import io
+import hashlib
+import bisect
+from collections import deque
 import math
-import tempfile
-import os
 import numpy as np
 import wave
 import struct
-from midiutil import MIDIFile
+import zlib
 import mido
-from typing import List, Tuple
+from typing import List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
+from itertools import accumulate, chain, takewhile
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the decoder falls back to plain Python
+    njit = None
 
 # Set page config
 st.set_page_config(
@@ -30,112 +40,198 @@ MORSE_CODE = {
     '8': '---..', '9': '----.', ' ': '/'
 }
 
+# Morse symbols for each ASCII code followed by a letter gap (' '), empty for
+# unsupported characters; the space character maps to a word gap ('/')
+MORSE_SYMBOLS = tuple(MORSE_CODE[chr(code)] + ' ' if chr(code) in MORSE_CODE else '' for code in range(128))
+
+# Reverse lookup used when decoding morse patterns back to letters. Patterns are
+# bit-packed behind a leading 1 bit (dot = 0, dash = 1), so '.-' becomes 0b101;
+# patterns up to 6 symbols long fit, unknown shapes decode to '?'
+def _build_morse_lut() -> bytearray:
+    """Build the bit-packed morse pattern -> letter table"""
+    lut = bytearray(b'?' * 128)
+    for letter, pattern in MORSE_CODE.items():
+        if pattern != '/':
+            code = 1
+            for symbol in pattern:
+                code = (code << 1) | (symbol == '-')
+            lut[code] = ord(letter)
+    return lut
+
+MORSE_LUT = _build_morse_lut()
+
+@lru_cache(maxsize=128)
+def text_to_morse_sequence(text: str) -> Tuple[str, ...]:
+    """Expand text into a flat tuple of morse symbols, skipping unsupported characters (cached per text)"""
+    # MORSE_CODE is all ASCII, so anything else can be dropped before the table lookup
+    return tuple(''.join([MORSE_SYMBOLS[code] for code in text.upper().encode('ascii', 'ignore')]))
+
+@lru_cache(maxsize=128)
+def _iter_morse_letters(message: str) -> Tuple[Tuple[str, str], ...]:
+    """(character, pattern) for each encodable non-space character of the message (cached per message)"""
+    return tuple((char, MORSE_CODE[char]) for char in message.upper() if char in MORSE_CODE and char != ' ')
+
+# Clock advance per morse symbol: dot/dash length plus a small gap, then letter and word gaps
+_SYMBOL_ADVANCE = {'.': 0.25 + 0.1, '-': 0.75 + 0.1, ' ': 0.3, '/': 0.8}
+
+@dataclass(frozen=True)
+class KeyInfo:
+    root: int
+    scale: Tuple[int, ...]
+    name: str
+
+@dataclass(frozen=True)
+class StyleInfo:
+    tempo: int
+    dynamics: str
+    name: str
+
 class MusicKey(Enum):
-    C_MAJOR = {"root": 60, "scale": [0, 2, 4, 5, 7, 9, 11], "name": "C Major"}
-    G_MAJOR = {"root": 67, "scale": [0, 2, 4, 5, 7, 9, 11], "name": "G Major"}
-    D_MAJOR = {"root": 62, "scale": [0, 2, 4, 5, 7, 9, 11], "name": "D Major"}
-    A_MINOR = {"root": 69, "scale": [0, 2, 3, 5, 7, 8, 10], "name": "A Minor"}
-    E_MINOR = {"root": 64, "scale": [0, 2, 3, 5, 7, 8, 10], "name": "E Minor"}
-    C_PENTATONIC = {"root": 60, "scale": [0, 2, 4, 7, 9], "name": "C Pentatonic"}
-    A_BLUES = {"root": 69, "scale": [0, 3, 5, 6, 7, 10], "name": "A Blues"}
+    C_MAJOR = KeyInfo(root=60, scale=(0, 2, 4, 5, 7, 9, 11), name="C Major")
+    G_MAJOR = KeyInfo(root=67, scale=(0, 2, 4, 5, 7, 9, 11), name="G Major")
+    D_MAJOR = KeyInfo(root=62, scale=(0, 2, 4, 5, 7, 9, 11), name="D Major")
+    A_MINOR = KeyInfo(root=69, scale=(0, 2, 3, 5, 7, 8, 10), name="A Minor")
+    E_MINOR = KeyInfo(root=64, scale=(0, 2, 3, 5, 7, 8, 10), name="E Minor")
+    C_PENTATONIC = KeyInfo(root=60, scale=(0, 2, 4, 7, 9), name="C Pentatonic")
+    A_BLUES = KeyInfo(root=69, scale=(0, 3, 5, 6, 7, 10), name="A Blues")
 
 class MusicStyle(Enum):
-    CLASSICAL = {"tempo": 90, "dynamics": "gentle", "name": "Classical"}
-    FOLK = {"tempo": 110, "dynamics": "warm", "name": "Folk"}
-    JAZZ = {"tempo": 120, "dynamics": "swing", "name": "Jazz"}
-    AMBIENT = {"tempo": 75, "dynamics": "floating", "name": "Ambient"}
-    CELTIC = {"tempo": 105, "dynamics": "lilting", "name": "Celtic"}
-
-@dataclass
-class Note:
+    CLASSICAL = StyleInfo(tempo=90, dynamics="gentle", name="Classical")
+    FOLK = StyleInfo(tempo=110, dynamics="warm", name="Folk")
+    JAZZ = StyleInfo(tempo=120, dynamics="swing", name="Jazz")
+    AMBIENT = StyleInfo(tempo=75, dynamics="floating", name="Ambient")
+    CELTIC = StyleInfo(tempo=105, dynamics="lilting", name="Celtic")
+
+class Note(NamedTuple):
     pitch: int
     start_time: float
     duration: float
     velocity: int
     channel: int = 0
 
+# Structure-of-arrays layout for handing note lists to numpy code
+NOTE_DTYPE = np.dtype([('time', 'f8'), ('dur', 'f8'), ('pitch', 'u1'), ('vel', 'u1'), ('ch', 'u1')])
+
+def notes_to_array(notes: List[Note]) -> np.ndarray:
+    """Pack notes into a structured array with one field per Note attribute"""
+    return np.array([(note.start_time, note.duration, note.pitch, note.velocity, note.channel)
+                     for note in notes], dtype=NOTE_DTYPE)
+
+def _create_interval_preferences(style_name: str) -> dict:
+    """Create interval preferences based on musical style"""
+    base_prefs = {
+        1: 0.20,   # Half step
+        2: 0.30,   # Whole step
+        3: 0.15,   # Minor third
+        4: 0.15,   # Major third
+        5: 0.10,   # Perfect fourth
+        7: 0.08,   # Perfect fifth
+        12: 0.02   # Octave
+    }
+    
+    # Modify based on style
+    if style_name == "Jazz":
+        base_prefs[3] *= 1.5  # More thirds
+        base_prefs[7] *= 1.5  # More fifths
+    elif style_name == "Celtic":
+        base_prefs[5] *= 1.8  # More fourths
+        base_prefs[7] *= 1.3  # More fifths
+    elif style_name == "Ambient":
+        base_prefs[1] *= 2.0  # More half steps
+        base_prefs[2] *= 1.5  # More whole steps
+        
+    return base_prefs
+
+def _create_phrase_contour(style_name: str) -> List[float]:
+    """Create a natural phrase contour (musical arc)"""
+    if style_name == "Classical":
+        # Classical arch: start low, peak 2/3 through, resolve down
+        return [0.2, 0.4, 0.6, 0.8, 0.9, 0.7, 0.4, 0.1]
+    elif style_name == "Folk":
+        # Folk: simple wave pattern
+        return [0.3, 0.6, 0.4, 0.7, 0.5, 0.8, 0.3, 0.2]
+    elif style_name == "Jazz":
+        # Jazz: more complex, unexpected
+        return [0.4, 0.2, 0.8, 0.3, 0.9, 0.1, 0.6, 0.4]
+    elif style_name == "Celtic":
+        # Celtic: flowing, modal
+        return [0.5, 0.7, 0.3, 0.8, 0.4, 0.9, 0.2, 0.5]
+    else:  # Ambient
+        # Ambient: gentle floating
+        return [0.4, 0.5, 0.6, 0.5, 0.4, 0.6, 0.5, 0.4]
+
+def _generate_scale_notes(key_info: KeyInfo) -> Tuple[int, ...]:
+    """Generate scale notes across multiple octaves"""
+    notes = []
+    root = key_info.root
+    scale = key_info.scale
+    
+    # Generate 3 octaves
+    for octave in [-1, 0, 1]:
+        for degree in scale:
+            note = root + (octave * 12) + degree
+            if 36 <= note <= 96:  # Keep in reasonable MIDI range
+                notes.append(note)
+    
+    return tuple(sorted(notes))
+
+# Style-dependent generator settings never change, so build them once at import
+_INTERVAL_PREFS_BY_STYLE = {style.value.name: _create_interval_preferences(style.value.name)
+                            for style in MusicStyle}
+_INTERVAL_WEIGHTS_BY_STYLE = {name: (tuple(prefs), list(accumulate(prefs.values())))
+                              for name, prefs in _INTERVAL_PREFS_BY_STYLE.items()}
+_PHRASE_CONTOUR_BY_STYLE = {style.value.name: _create_phrase_contour(style.value.name)
+                            for style in MusicStyle}
+
+# Likewise the scale notes of each key, shared read-only by every generator
+_SCALE_NOTES_BY_KEY = {key.value.name: _generate_scale_notes(key.value) for key in MusicKey}
+
 class IntelligentMelodyGenerator:
     """Completely new melody generator that creates genuinely musical phrases"""
     
-    def __init__(self, key: MusicKey, style: MusicStyle):
+    def __init__(self, key: MusicKey, style: MusicStyle, rng: Optional[random.Random] = None):
         self.key = key.value
         self.style = style.value
-        self.scale_notes = self._generate_scale_notes()
+        self._rng = rng if rng is not None else random.Random()
+        self.scale_notes = _SCALE_NOTES_BY_KEY[self.key.name]
+        
+        # Scale bounds never change, so normalize against cached values
+        self._scale_min = self.scale_notes[0]
+        self._scale_max = self.scale_notes[-1]
+        self._scale_span = self._scale_max - self._scale_min
+        
+        # Comfortable middle range used for opening notes
+        self._opening_notes = [n for n in self.scale_notes if self.key.root <= n <= self.key.root + 7]
         
         # Musical memory for intelligent decisions
-        self.recent_notes = []
+        self.recent_notes = deque(maxlen=6)
         self.phrase_position = 0
         self.phrase_direction = 0
         
         # Musical intelligence parameters
-        self.interval_preferences = self._create_interval_preferences()
-        self.phrase_contour = self._create_phrase_contour()
-        
-    def _generate_scale_notes(self) -> List[int]:
-        """Generate scale notes across multiple octaves"""
-        notes = []
-        root = self.key["root"]
-        scale = self.key["scale"]
-        
-        # Generate 3 octaves
-        for octave in [-1, 0, 1]:
-            for degree in scale:
-                note = root + (octave * 12) + degree
-                if 36 <= note <= 96:  # Keep in reasonable MIDI range
-                    notes.append(note)
-        
-        return sorted(notes)
-    
-    def _create_interval_preferences(self) -> dict:
-        """Create interval preferences based on musical style"""
-        base_prefs = {
-            1: 0.20,   # Half step
-            2: 0.30,   # Whole step
-            3: 0.15,   # Minor third
-            4: 0.15,   # Major third
-            5: 0.10,   # Perfect fourth
-            7: 0.08,   # Perfect fifth
-            12: 0.02   # Octave
-        }
-        
-        # Modify based on style
-        if self.style["name"] == "Jazz":
-            base_prefs[3] *= 1.5  # More thirds
-            base_prefs[7] *= 1.5  # More fifths
-        elif self.style["name"] == "Celtic":
-            base_prefs[5] *= 1.8  # More fourths
-            base_prefs[7] *= 1.3  # More fifths
-        elif self.style["name"] == "Ambient":
-            base_prefs[1] *= 2.0  # More half steps
-            base_prefs[2] *= 1.5  # More whole steps
-            
-        return base_prefs
-    
-    def _create_phrase_contour(self) -> List[float]:
-        """Create a natural phrase contour (musical arc)"""
-        if self.style["name"] == "Classical":
-            # Classical arch: start low, peak 2/3 through, resolve down
-            return [0.2, 0.4, 0.6, 0.8, 0.9, 0.7, 0.4, 0.1]
-        elif self.style["name"] == "Folk":
-            # Folk: simple wave pattern
-            return [0.3, 0.6, 0.4, 0.7, 0.5, 0.8, 0.3, 0.2]
-        elif self.style["name"] == "Jazz":
-            # Jazz: more complex, unexpected
-            return [0.4, 0.2, 0.8, 0.3, 0.9, 0.1, 0.6, 0.4]
-        elif self.style["name"] == "Celtic":
-            # Celtic: flowing, modal
-            return [0.5, 0.7, 0.3, 0.8, 0.4, 0.9, 0.2, 0.5]
-        else:  # Ambient
-            # Ambient: gentle floating
-            return [0.4, 0.5, 0.6, 0.5, 0.4, 0.6, 0.5, 0.4]
-    
-    def _get_phrase_target(self, position: int) -> float:
-        """Get the target height for this position in the phrase"""
-        if not self.phrase_contour:
-            return 0.5
-        
-        index = min(position, len(self.phrase_contour) - 1)
-        return self.phrase_contour[index]
+        self.interval_preferences = _INTERVAL_PREFS_BY_STYLE[self.style.name]
+        self._intervals, self._cum_weights = _INTERVAL_WEIGHTS_BY_STYLE[self.style.name]
+        self.phrase_contour = _PHRASE_CONTOUR_BY_STYLE[self.style.name]
+        self._contour = tuple(self.phrase_contour)
+        self._contour_last = len(self._contour) - 1
+        
+        # Nearest scale note for every candidate a single interval step can reach
+        self._snap_base = self._scale_min - max(self._intervals)
+        self._snap_lut = tuple(self._snap_to_scale(note)
+                               for note in range(self._snap_base, self._scale_max + max(self._intervals) + 1))
+        
+    def _snap_to_scale(self, candidate_note: int) -> int:
+        """Find the closest scale note with a binary search (ties go to the lower note)"""
+        scale_notes = self.scale_notes
+        index = bisect.bisect_left(scale_notes, candidate_note)
+        if index == 0:
+            return scale_notes[0]
+        if index == len(scale_notes):
+            return scale_notes[-1]
+        
+        lower = scale_notes[index - 1]
+        upper = scale_notes[index]
+        return lower if candidate_note - lower <= upper - candidate_note else upper
     
     def _choose_note_intelligently(self, morse_symbol: str, phrase_pos: int) -> int:
         """Choose a note using musical intelligence"""
@@ -143,189 +239,180 @@ class IntelligentMelodyGenerator:
         # First note of the piece
         if not self.recent_notes:
             # Start in a comfortable middle range
-            middle_notes = [n for n in self.scale_notes if self.key["root"] <= n <= self.key["root"] + 7]
-            return random.choice(middle_notes)
+            return self._rng.choice(self._opening_notes)
         
         current_note = self.recent_notes[-1]
-        phrase_target = self._get_phrase_target(phrase_pos)
+        # Target height for this position in the phrase; long phrases hold the last value
+        contour = self._contour
+        phrase_target = contour[phrase_pos] if phrase_pos <= self._contour_last else contour[-1]
         
         # Determine if we should go up, down, or stay
-        current_height = (current_note - min(self.scale_notes)) / (max(self.scale_notes) - min(self.scale_notes))
+        current_height = (current_note - self._scale_min) / self._scale_span
         
         if current_height < phrase_target - 0.2:
             direction = 1  # Go up
         elif current_height > phrase_target + 0.2:
             direction = -1  # Go down
         else:
-            direction = random.choice([-1, 1])  # Either way
+            direction = self._rng.choice([-1, 1])  # Either way
         
         # Modify direction based on morse symbol
-        if morse_symbol == '.' and random.random() < 0.3:
+        if morse_symbol == '.' and self._rng.random() < 0.3:
             direction = -1  # Dots tend to be lower
-        elif morse_symbol == '-' and random.random() < 0.3:
+        elif morse_symbol == '-' and self._rng.random() < 0.3:
             direction = 1   # Dashes tend to be higher
         
-        # Choose interval based on preferences and recent motion
-        intervals = list(self.interval_preferences.keys())
-        weights = list(self.interval_preferences.values())
-        
         # Avoid too much motion in one direction
-        if len(self.recent_notes) >= 3:
-            recent_direction = sum([
-                1 if self.recent_notes[i] > self.recent_notes[i-1] else -1
-                for i in range(-2, 0)
-            ])
+        recent = self.recent_notes
+        if len(recent) >= 3:
+            recent_direction = (1 if recent[-1] > recent[-2] else -1) + (1 if recent[-2] > recent[-3] else -1)
             if abs(recent_direction) >= 2:  # Too much in one direction
                 direction *= -1  # Force change
         
-        # Choose interval
-        chosen_interval = random.choices(intervals, weights=weights)[0]
+        # Choose interval based on preferences (cumulative weights are precomputed)
+        chosen_interval = self._rng.choices(self._intervals, cum_weights=self._cum_weights)[0]
         candidate_note = current_note + (chosen_interval * direction)
         
-        # Snap to nearest scale note
-        final_note = min(self.scale_notes, key=lambda x: abs(x - candidate_note))
+        # Snap to nearest scale note (candidates stay within one interval of the scale)
+        final_note = self._snap_lut[candidate_note - self._snap_base]
         
         # Ensure we don't go out of range
-        if final_note < min(self.scale_notes) or final_note > max(self.scale_notes):
+        if final_note < self._scale_min or final_note > self._scale_max:
             final_note = current_note  # Stay put if out of range
         
-        self.recent_notes.append(final_note)
-        if len(self.recent_notes) > 6:  # Keep only recent notes
-            self.recent_notes.pop(0)
+        self.recent_notes.append(final_note)  # Bounded deque keeps only recent notes
         
         return final_note
     
     def generate_melody(self, morse_text: str) -> List[Note]:
         """Generate a beautiful melody from morse code"""
-        notes = []
-        current_time = 0.0
         dot_duration = 0.25
         dash_duration = 0.75
         
-        # Convert text to morse
-        morse_sequence = []
-        for char in morse_text.upper():
-            if char in MORSE_CODE:
-                morse_sequence.extend(list(MORSE_CODE[char]))
-                morse_sequence.append(' ')  # Letter separation
-            elif char == ' ':
-                morse_sequence.append('/')  # Word separation
+        # Convert text to morse, keeping the display form for callers
+        morse_sequence = text_to_morse_sequence(morse_text)
+        self.last_morse_string = ''.join(morse_sequence).strip()
+        if not morse_sequence:
+            self.total_duration = 0.0
+            return []
+        
+        # Each symbol advances the clock by its note plus a small gap, or by a letter/word gap;
+        # a running sum of the preceding advances gives every symbol's start time in one pass
+        advances = np.zeros(len(morse_sequence))
+        advances[1:] = [_SYMBOL_ADVANCE[symbol] for symbol in morse_sequence[:-1]]
+        starts = np.cumsum(advances).tolist()
+        
+        # Pitches depend on the previous choice and the shared seeded RNG, so the walk stays sequential
+        choose_note = self._choose_note_intelligently
+        randint = self._rng.randint
+        notes = []
+        add_note = notes.append
         
         # Generate melody with musical intelligence
         phrase_pos = 0
-        for symbol in morse_sequence:
+        for symbol, start_time in zip(morse_sequence, starts):
             if symbol == '.':
-                pitch = self._choose_note_intelligently('.', phrase_pos)
-                velocity = random.randint(70, 90)
-                notes.append(Note(pitch, current_time, dot_duration, velocity))
-                current_time += dot_duration + 0.1  # Small gap
+                pitch = choose_note('.', phrase_pos)
+                add_note(Note(pitch, start_time, dot_duration, randint(70, 90)))
                 phrase_pos += 1
                 
             elif symbol == '-':
-                pitch = self._choose_note_intelligently('-', phrase_pos)
-                velocity = random.randint(75, 95)
-                notes.append(Note(pitch, current_time, dash_duration, velocity))
-                current_time += dash_duration + 0.1  # Small gap
+                pitch = choose_note('-', phrase_pos)
+                add_note(Note(pitch, start_time, dash_duration, randint(75, 95)))
                 phrase_pos += 1
                 
-            elif symbol == ' ':
-                current_time += 0.3  # Letter gap
-                
             elif symbol == '/':
-                current_time += 0.8  # Word gap
-                phrase_pos = 0  # Reset phrase position
+                phrase_pos = 0  # Reset phrase position at word gaps
+        
+        # Notes are emitted in time order, so the last one ends the melody
+        self.total_duration = notes[-1].start_time + notes[-1].duration if notes else 0.0
         
         return notes
 
+@lru_cache(maxsize=64)
+def _create_progressions(style_name: str, root: int) -> List[List[int]]:
+    """Create different chord progressions for different styles (cached per style and root)"""
+    progressions = {
+        "Classical": [
+            [root, root + 4, root + 7],           # I
+            [root + 9, root + 1, root + 4],       # vi
+            [root + 5, root + 9, root + 0],       # IV
+            [root + 7, root + 11, root + 2]       # V
+        ],
+        "Folk": [
+            [root, root + 4, root + 7],           # I
+            [root + 7, root + 11, root + 2],      # V
+            [root + 5, root + 9, root + 0],       # IV
+            [root, root + 4, root + 7]            # I
+        ],
+        "Jazz": [
+            [root, root + 4, root + 7, root + 11], # Imaj7
+            [root + 9, root + 1, root + 4, root + 8], # vi7
+            [root + 2, root + 6, root + 9, root + 0], # ii7
+            [root + 7, root + 11, root + 2, root + 5] # V7
+        ],
+        "Celtic": [
+            [root, root + 7],                     # I (open fifth)
+            [root + 7, root + 2],                 # V
+            [root + 5, root + 0],                 # IV
+            [root, root + 7]                      # I
+        ],
+        "Ambient": [
+            [root, root + 4, root + 7, root + 11, root + 14], # Extended chords
+            [root + 2, root + 6, root + 9, root + 1, root + 4],
+            [root + 5, root + 9, root + 0, root + 4, root + 7],
+            [root - 5, root - 1, root + 2, root + 6, root + 9]
+        ]
+    }
+    
+    return progressions.get(style_name, progressions["Classical"])
+
 class ChordProgressionGenerator:
     """Generate intelligent chord progressions that complement the melody"""
     
-    def __init__(self, key: MusicKey, style: MusicStyle):
+    def __init__(self, key: MusicKey, style: MusicStyle, rng: Optional[random.Random] = None):
         self.key = key.value
         self.style = style.value
-        self.progressions = self._create_progressions()
-    
-    def _create_progressions(self) -> dict:
-        """Create different chord progressions for different styles"""
-        root = self.key["root"]
-        
-        progressions = {
-            "Classical": [
-                [root, root + 4, root + 7],           # I
-                [root + 9, root + 1, root + 4],       # vi
-                [root + 5, root + 9, root + 0],       # IV
-                [root + 7, root + 11, root + 2]       # V
-            ],
-            "Folk": [
-                [root, root + 4, root + 7],           # I
-                [root + 7, root + 11, root + 2],      # V
-                [root + 5, root + 9, root + 0],       # IV
-                [root, root + 4, root + 7]            # I
-            ],
-            "Jazz": [
-                [root, root + 4, root + 7, root + 11], # Imaj7
-                [root + 9, root + 1, root + 4, root + 8], # vi7
-                [root + 2, root + 6, root + 9, root + 0], # ii7
-                [root + 7, root + 11, root + 2, root + 5] # V7
-            ],
-            "Celtic": [
-                [root, root + 7],                     # I (open fifth)
-                [root + 7, root + 2],                 # V
-                [root + 5, root + 0],                 # IV
-                [root, root + 7]                      # I
-            ],
-            "Ambient": [
-                [root, root + 4, root + 7, root + 11, root + 14], # Extended chords
-                [root + 2, root + 6, root + 9, root + 1, root + 4],
-                [root + 5, root + 9, root + 0, root + 4, root + 7],
-                [root - 5, root - 1, root + 2, root + 6, root + 9]
-            ]
-        }
-        
-        return progressions.get(self.style["name"], progressions["Classical"])
+        self._rng = rng if rng is not None else random.Random()
+        self.progressions = _create_progressions(self.style.name, self.key.root)
+        
+        # Each chord as (pitch an octave down, roll offset) voices, reused on every repeat
+        self._rolled_chords = [[(pitch - 12, i * 0.02) for i, pitch in enumerate(chord)]
+                               for chord in self.progressions]
     
     def generate_harmony(self, melody_duration: float) -> List[Note]:
         """Generate harmony notes to accompany the melody"""
-        harmony_notes = []
         chord_duration = 2.0  # Each chord lasts 2 beats
-        current_time = 0.0
-        chord_index = 0
-        
-        while current_time < melody_duration:
-            chord = self.progressions[chord_index % len(self.progressions)]
-            
-            # Add chord notes with slight timing variations
-            for i, pitch in enumerate(chord):
-                note_time = current_time + (i * 0.02)  # Slight roll
-                velocity = random.randint(50, 70)  # Softer than melody
-                harmony_notes.append(Note(pitch - 12, note_time, chord_duration, velocity, channel=1))
-            
-            current_time += chord_duration
-            chord_index += 1
+        chord_count = math.ceil(melody_duration / chord_duration)  # Chords starting before the melody ends
+        rolled_chords = self._rolled_chords
+        randint = self._rng.randint
         
-        return harmony_notes
+        # Chord notes with a slight roll, softer than the melody
+        return [Note(pitch, chord_index * chord_duration + roll, chord_duration, randint(50, 70), channel=1)
+                for chord_index in range(chord_count)
+                for pitch, roll in rolled_chords[chord_index % len(rolled_chords)]]
+
+# Equal-tempered frequency of every MIDI note number (A4 = 69 = 440 Hz)
+_MIDI_FREQ = 440.0 * (2.0 ** ((np.arange(128) - 69) / 12.0))
 
 def create_web_audio_player(melody_notes: List[Note], harmony_notes: List[Note] = None) -> str:
     """Create an enhanced web audio player for the generated music"""
     
-    # Combine all notes for playback
-    all_notes = melody_notes.copy()
-    if harmony_notes:
-        all_notes.extend(harmony_notes)
-    
-    # Convert notes to JSON format
-    notes_data = []
-    for note in all_notes:
-        notes_data.append({
-            "pitch": note.pitch,
-            "start": note.start_time,
-            "duration": note.duration,
-            "velocity": note.velocity,
-            "channel": note.channel
-        })
+    # Iterate melody and harmony in place rather than copying them into one list
+    note_lists = (melody_notes, harmony_notes or ())
+    
+    # Convert notes to compact JSON, parsed once by the player script
+    notes_data = [{
+        "pitch": note.pitch,
+        "start": note.start_time,
+        "duration": note.duration,
+        "velocity": note.velocity,
+        "channel": note.channel
+    } for note in chain.from_iterable(note_lists)]
+    notes_json = json.dumps(notes_data, separators=(',', ':'))
     
     # Calculate total duration
-    total_duration = max(note.start_time + note.duration for note in all_notes) if all_notes else 0
+    total_duration = max((note.start_time + note.duration for note in chain.from_iterable(note_lists)), default=0)
     
     audio_html = f"""
     <div style="
@@ -396,6 +483,7 @@ def create_web_audio_player(melody_notes: List[Note], harmony_notes: List[Note]
         </div>
     </div>
 
+    <script id="notesData" type="application/json">{notes_json}</script>
     <script>
     let audioContext;
     let isPlaying = false;
@@ -404,11 +492,12 @@ def create_web_audio_player(melody_notes: List[Note], harmony_notes: List[Note]
     let scheduledNotes = [];
     let animationFrame;
     
-    const notesData = {notes_data};
+    const notesData = JSON.parse(document.getElementById('notesData').textContent);
     const totalDuration = {total_duration};
+    const MIDI_FREQ = {_MIDI_FREQ.tolist()};
     
     function midiToFreq(midiNote) {{
-        return 440 * Math.pow(2, (midiNote - 69) / 12);
+        return MIDI_FREQ[midiNote];
     }}
     
     function formatTime(seconds) {{
@@ -560,180 +649,291 @@ def create_web_audio_player(melody_notes: List[Note], harmony_notes: List[Note]
     
     return audio_html
 
+@lru_cache(maxsize=16)
+def _envelope(length: int) -> np.ndarray:
+    """ADSR envelope for a note of the given sample count (cached and read-only, since note lengths repeat)"""
+    envelope = np.ones(length)
+    
+    # Attack (5% of note)
+    attack_samples = max(1, int(0.05 * length))
+    if attack_samples < length:
+        envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
+    
+    # Release (20% of note)
+    release_samples = max(1, int(0.2 * length))
+    if release_samples < length:
+        envelope[-release_samples:] = np.linspace(1, 0, release_samples)
+    
+    envelope.setflags(write=False)
+    return envelope
+
+def _oscillator(omega: np.ndarray, step: float, length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sine and cosine of omega * i * step for i < length, one row per angular frequency"""
+    sines = np.empty((len(omega), length))
+    cosines = np.empty((len(omega), length))
+    omega = omega[:, None]
+    
+    # Evaluate a short prefix directly, then extend it by angle addition: rotating the
+    # filled prefix by its own length doubles it, so long notes need only a few passes
+    filled = min(length, _OSCILLATOR_SEED_SAMPLES)
+    phase = omega * (np.arange(filled) * step)
+    sines[:, :filled] = np.sin(phase)
+    cosines[:, :filled] = np.cos(phase)
+    while filled < length:
+        width = min(filled, length - filled)
+        shift = omega * (filled * step)
+        shift_sin, shift_cos = np.sin(shift), np.cos(shift)
+        prefix_sin, prefix_cos = sines[:, :width], cosines[:, :width]
+        next_sin, next_cos = sines[:, filled:filled + width], cosines[:, filled:filled + width]
+        np.multiply(prefix_sin, shift_cos, out=next_sin)
+        next_sin += prefix_cos * shift_sin
+        np.multiply(prefix_cos, shift_cos, out=next_cos)
+        next_cos -= prefix_sin * shift_sin
+        filled += width
+    
+    return sines, cosines
+
+def _mix_waveform(audio, wave, envelope, starts, volumes, left_gain, right_gain):
+    """Add a shared waveform at each note start, scaled by the envelope, note volume and channel gain"""
+    end_offset = len(wave)
+    for start, volume in zip(starts, volumes):
+        note_wave = wave * (envelope * volume)
+        audio[start:start + end_offset, 0] += note_wave * left_gain
+        audio[start:start + end_offset, 1] += note_wave * right_gain
+
+def _mix_waveform_loops(audio, wave, envelope, starts, volumes, left_gain, right_gain):
+    """Sample-by-sample _mix_waveform; compiled, it scales and adds each note in a single pass"""
+    length = wave.shape[0]
+    
+    # Notes overlap in the output, so they are mixed one after another rather than in parallel
+    for n in range(starts.shape[0]):
+        start = starts[n]
+        volume = volumes[n]
+        for i in range(length):
+            sample = wave[i] * (envelope[i] * volume)
+            audio[start + i, 0] += sample * left_gain
+            audio[start + i, 1] += sample * right_gain
+
+if njit is not None:
+    _mix_waveform = njit(cache=True)(_mix_waveform_loops)
+
+# Samples per note evaluated with sin/cos before the oscillator switches to rotation
+_OSCILLATOR_SEED_SAMPLES = 64
+
+# Samples synthesized per vectorized batch; keeps the temporary arrays cache-sized
+_SYNTH_BATCH_SAMPLES = 1 << 16
+
 def generate_wav_from_notes(melody_notes: List[Note], harmony_notes: List[Note] = None, sample_rate: int = 44100) -> bytes:
     """Generate a WAV file directly from note data using pure Python audio synthesis"""
     
-    # Combine all notes
-    all_notes = melody_notes.copy()
-    if harmony_notes:
-        all_notes.extend(harmony_notes)
-    
-    if not all_notes:
+    # Iterate melody and harmony in place rather than copying them into one list
+    note_lists = (melody_notes, harmony_notes or ())
+    if not any(note_lists):
         return b""
     
     # Calculate total duration
-    total_duration = max(note.start_time + note.duration for note in all_notes)
+    total_duration = max(note.start_time + note.duration for note in chain.from_iterable(note_lists))
     total_samples = int(total_duration * sample_rate)
     
-    # Create stereo audio buffer
-    audio_left = np.zeros(total_samples, dtype=np.float32)
-    audio_right = np.zeros(total_samples, dtype=np.float32)
+    # Create stereo audio buffer, already interleaved as (left, right) frames
+    audio = np.zeros((total_samples, 2), dtype=np.float32)
     
-    for note in all_notes:
-        # Convert MIDI note to frequency
-        frequency = 440.0 * (2.0 ** ((note.pitch - 69) / 12.0))
-        
+    # Notes with the same length and channel share a time axis and envelope, and
+    # within such a group the unscaled waveform depends only on pitch. Group notes
+    # that way so each distinct waveform is synthesized once, in 2-D batches.
+    groups = {}
+    for note in chain.from_iterable(note_lists):
         # Calculate sample positions
         start_sample = int(note.start_time * sample_rate)
         duration_samples = int(note.duration * sample_rate)
         end_sample = min(start_sample + duration_samples, total_samples)
         
-        if start_sample >= total_samples:
+        if start_sample >= total_samples or end_sample <= start_sample:
             continue
         
-        # Generate time array for this note
-        t = np.linspace(0, note.duration, end_sample - start_sample)
-        
-        # Create waveform based on channel (melody vs harmony)
-        if note.channel == 0:  # Melody
-            # Rich harmonic content for melody
-            wave = (np.sin(2 * np.pi * frequency * t) * 0.6 +
-                   np.sin(2 * np.pi * frequency * 2 * t) * 0.2 +
-                   np.sin(2 * np.pi * frequency * 3 * t) * 0.1)
-        else:  # Harmony
-            # Softer waveform for harmony
-            wave = (np.sin(2 * np.pi * frequency * t) * 0.4 +
-                   np.sin(2 * np.pi * frequency * 2 * t) * 0.1)
-        
-        # Apply envelope (ADSR - Attack, Decay, Sustain, Release)
-        envelope = np.ones_like(t)
-        
-        # Attack (5% of note)
-        attack_samples = max(1, int(0.05 * len(t)))
-        if attack_samples < len(envelope):
-            envelope[:attack_samples] = np.linspace(0, 1, attack_samples)
-        
-        # Release (20% of note)
-        release_samples = max(1, int(0.2 * len(t)))
-        if release_samples < len(envelope):
-            envelope[-release_samples:] = np.linspace(1, 0, release_samples)
-        
-        # Apply velocity
-        volume = (note.velocity / 127.0) * 0.3  # Scale down to prevent clipping
-        wave *= envelope * volume
-        
-        # Add to audio buffers (stereo)
-        if note.channel == 0:  # Melody - center
-            audio_left[start_sample:end_sample] += wave
-            audio_right[start_sample:end_sample] += wave
-        else:  # Harmony - slightly left and right for width
-            audio_left[start_sample:end_sample] += wave * 1.1
-            audio_right[start_sample:end_sample] += wave * 0.9
-    
-    # Normalize audio to prevent clipping
-    max_val = max(np.max(np.abs(audio_left)), np.max(np.abs(audio_right)))
-    if max_val > 0:
-        audio_left = audio_left / max_val * 0.8
-        audio_right = audio_right / max_val * 0.8
-    
-    # Convert to 16-bit PCM
-    audio_left_int = (audio_left * 32767).astype(np.int16)
-    audio_right_int = (audio_right * 32767).astype(np.int16)
-    
-    # Interleave stereo channels
-    stereo_audio = np.empty((audio_left_int.size + audio_right_int.size,), dtype=np.int16)
-    stereo_audio[0::2] = audio_left_int
-    stereo_audio[1::2] = audio_right_int
-    
-    # Create WAV file in memory
-    import io
-    wav_buffer = io.BytesIO()
-    
-    # Write WAV file manually
-    # WAV header
-    wav_buffer.write(b'RIFF')
-    wav_buffer.write(struct.pack('<I', 36 + len(stereo_audio) * 2))  # File size
-    wav_buffer.write(b'WAVE')
-    wav_buffer.write(b'fmt ')
-    wav_buffer.write(struct.pack('<I', 16))  # Subchunk1 size
-    wav_buffer.write(struct.pack('<H', 1))   # Audio format (PCM)
-    wav_buffer.write(struct.pack('<H', 2))   # Channels (stereo)
-    wav_buffer.write(struct.pack('<I', sample_rate))  # Sample rate
-    wav_buffer.write(struct.pack('<I', sample_rate * 2 * 2))  # Byte rate
-    wav_buffer.write(struct.pack('<H', 4))   # Block align
-    wav_buffer.write(struct.pack('<H', 16))  # Bits per sample
-    wav_buffer.write(b'data')
-    wav_buffer.write(struct.pack('<I', len(stereo_audio) * 2))  # Data size
-    wav_buffer.write(stereo_audio.tobytes())
-    
-    return wav_buffer.getvalue()
-
-def create_audio_player_with_wav(wav_data: bytes) -> str:
-    """Create an audio player that uses the generated WAV file"""
-    import base64
-    
-    # Convert WAV data to base64 for embedding
-    wav_base64 = base64.b64encode(wav_data).decode()
+        group = groups.setdefault((end_sample - start_sample, note.duration, note.channel), {})
+        group.setdefault(note.pitch, []).append((start_sample, note.velocity))
     
-    audio_html = f"""
-    <div style="
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 25px;
-        border-radius: 15px;
-        margin: 20px 0;
-        color: white;
-        box-shadow: 0 8px 32px rgba(0,0,0,0.3);
-    ">
-        <h3 style="margin-top: 0; color: white; text-align: center;">🎧 Play Your Melody</h3>
+    for (length, duration, channel), notes_by_pitch in groups.items():
+        # Sample spacing of the note's time axis (0 to duration inclusive)
+        step = duration / (length - 1) if length > 1 else 0.0
         
-        <div style="text-align: center; margin: 20px 0;">
-            <audio controls style="width: 100%; max-width: 500px;">
-                <source src="data:audio/wav;base64,{wav_base64}" type="audio/wav">
-                Your browser does not support the audio element.
-            </audio>
-        </div>
+        envelope = _envelope(length)
         
-        <div style="text-align: center; margin-top: 15px; font-size: 14px; opacity: 0.8;">
-            🎵 High-Quality WAV Audio • 🎶 Stereo Sound
-        </div>
-    </div>
-    """
-    
-    return audio_html
+        # Bound the temporary (rows x length) arrays for long notes
+        pitches = list(notes_by_pitch)
+        batch_rows = max(1, _SYNTH_BATCH_SAMPLES // length)
+        for batch_start in range(0, len(pitches), batch_rows):
+            batch_pitches = pitches[batch_start:batch_start + batch_rows]
+            
+            # Convert MIDI notes to angular frequencies, one row per pitch
+            frequencies = _MIDI_FREQ[batch_pitches]
+            fundamental, cosine = _oscillator(2 * np.pi * frequencies, step, length)
+            
+            # Overtones follow from the fundamental: sin((k+1)x) = 2cos(x)sin(kx) - sin((k-1)x).
+            # Buffers are updated in place, so a batch allocates a single extra array.
+            twice_cosine = np.multiply(cosine, 2, out=cosine)
+            second = twice_cosine * fundamental
+            
+            # Create waveforms based on channel (melody vs harmony)
+            if channel == 0:  # Melody
+                # Rich harmonic content for melody
+                third = np.multiply(twice_cosine, second, out=twice_cosine)
+                third -= fundamental
+                waves = np.multiply(fundamental, 0.6, out=fundamental)
+                waves += np.multiply(second, 0.2, out=second)
+                waves += np.multiply(third, 0.1, out=third)
+            else:  # Harmony
+                # Softer waveform for harmony
+                waves = np.multiply(fundamental, 0.4, out=fundamental)
+                waves += np.multiply(second, 0.1, out=second)
+            
+            # Melody sits in the center; harmony is spread slightly left and right for width
+            left_gain, right_gain = (1.0, 1.0) if channel == 0 else (1.1, 0.9)
+            
+            for pitch, wave in zip(batch_pitches, waves):
+                starts, velocities = zip(*notes_by_pitch[pitch])
+                volumes = (np.array(velocities) / 127.0) * 0.3  # Scale down to prevent clipping
+                _mix_waveform(audio, wave, envelope,
+                              np.array(starts, dtype=np.int64), volumes, left_gain, right_gain)
+    
+    # Normalize to 80% of full scale in place to prevent clipping
+    max_val = max(audio.max(), -audio.min())
+    if max_val > 0:
+        audio *= 0.8 * 32767 / max_val
+    
+    # Convert to 16-bit PCM; the frame layout is already interleaved
+    stereo_audio = audio.astype(np.int16).reshape(-1)
+    
+    # WAV header for 16-bit stereo PCM
+    data_size = stereo_audio.nbytes
+    header = struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size,      # File size
+        b'WAVE', b'fmt ', 16,         # Subchunk1 size
+        1,                            # Audio format (PCM)
+        2,                            # Channels (stereo)
+        sample_rate,                  # Sample rate
+        sample_rate * 2 * 2,          # Byte rate
+        4,                            # Block align
+        16,                           # Bits per sample
+        b'data', data_size            # Data size
+    )
+    
+    # Join reads the samples straight from the array buffer, so they are copied once
+    return b''.join([header, memoryview(stereo_audio).cast('B')])
+
+MIDI_TICKS_PER_BEAT = 960
+MIDI_TEMPO_BPM = 120
+_MIDI_END_OF_TRACK = b'\x00\xff\x2f\x00'
+
+def _midi_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """Wrap data in a length-prefixed MIDI chunk"""
+    return chunk_type + struct.pack('>I', len(data)) + data
+
+def _build_midi_track(notes: List[Note], channel: int, program: int) -> bytes:
+    """Serialize notes into an MTrk chunk from a time-sorted numpy event table"""
+    events = notes_to_array(notes)
+    
+    # Truncate beats to ticks exactly as midiutil did so decoding timing is unchanged
+    on_ticks = (events['time'] * MIDI_TICKS_PER_BEAT).astype(np.int64)
+    off_ticks = on_ticks + (events['dur'] * MIDI_TICKS_PER_BEAT).astype(np.int64)
+    
+    # Order by tick, then note-off before note-on, then insertion order
+    count = len(events)
+    ticks = np.concatenate([off_ticks, on_ticks])
+    is_on = np.repeat([False, True], count)
+    note_index = np.tile(np.arange(count), 2)
+    order = np.lexsort((note_index, is_on, ticks))
+    
+    # A pitch restarted while still sounding cuts the earlier note off at the restart
+    pitches = events['pitch'].tolist()
+    channels = events['ch'].tolist()
+    sounding = {}
+    cut_short = False
+    for event in order.tolist():
+        key = (pitches[event % count], channels[event % count])
+        if event >= count:
+            sounding.setdefault(key, []).append(ticks[event])
+        else:
+            starts = sounding[key]
+            restart_tick = starts.pop()
+            if starts:
+                ticks[event] = restart_tick
+                cut_short = True
+    if cut_short:
+        order = np.lexsort((note_index, is_on, ticks))
+    
+    # Encode delta times as 1-4 byte variable-length quantities, most significant group first
+    deltas = np.diff(ticks[order], prepend=0)
+    groups = (deltas[:, None] >> np.array([21, 14, 7, 0])) & 0x7F
+    groups[:, :3] |= 0x80
+    group_count = 1 + (deltas >= 1 << 7) + (deltas >= 1 << 14) + (deltas >= 1 << 21)
+    keep_group = np.arange(4) >= (4 - group_count)[:, None]
+    
+    # Note-off is 0x80 and note-on 0x90, both carrying the note's velocity
+    sorted_notes = events[note_index[order]]
+    status = np.where(is_on[order], 0x90, 0x80) | sorted_notes['ch']
+    rows = np.column_stack([groups, status, sorted_notes['pitch'], sorted_notes['vel']]).astype(np.uint8)
+    keep = np.column_stack([keep_group, np.ones((len(rows), 3), dtype=bool)])
+    
+    program_change = bytes([0x00, 0xC0 | channel, program])
+    return _midi_chunk(b'MTrk', program_change + rows[keep].tobytes() + _MIDI_END_OF_TRACK)
 
 def create_midi_file(melody_notes: List[Note], harmony_notes: List[Note] = None) -> bytes:
     """Create a MIDI file from the generated notes"""
-    # Calculate number of tracks
-    num_tracks = 2 if harmony_notes else 1
-    midi = MIDIFile(num_tracks)
-    
-    # Set tempo
-    tempo = 120
-    midi.addTempo(0, 0, tempo)
+    # Tempo track, then piano melody and optional strings harmony
+    tempo = mido.bpm2tempo(MIDI_TEMPO_BPM).to_bytes(3, 'big')
+    tracks = [_midi_chunk(b'MTrk', b'\x00\xff\x51\x03' + tempo + _MIDI_END_OF_TRACK),
+              _build_midi_track(melody_notes, 0, 0)]
     if harmony_notes:
-        midi.addTempo(1, 0, tempo)
-    
-    # Set instruments
-    midi.addProgramChange(0, 0, 0, 0)  # Piano for melody
-    if harmony_notes:
-        midi.addProgramChange(1, 1, 0, 48)  # Strings for harmony
-    
-    # Add melody notes
-    for note in melody_notes:
-        midi.addNote(0, note.channel, note.pitch, note.start_time, note.duration, note.velocity)
-    
-    # Add harmony notes
-    if harmony_notes:
-        for note in harmony_notes:
-            midi.addNote(1, note.channel, note.pitch, note.start_time, note.duration, note.velocity)
-    
-    # Create bytes
-    import io
-    midi_bytes = io.BytesIO()
-    midi.writeFile(midi_bytes)
-    return midi_bytes.getvalue()
-
-def generate_svg_sheet_music(melody_notes: List[Note], message: str, key_info: dict) -> str:
+        tracks.append(_build_midi_track(harmony_notes, 1, 48))
+    
+    # Join header and tracks in one pass so the file is only copied once
+    header = _midi_chunk(b'MThd', struct.pack('>HHH', 1, len(tracks), MIDI_TICKS_PER_BEAT))
+    return b''.join([header, *tracks])
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _compose_melody(message: str, key_name: str, style_name: str, add_harmony: bool,
+                    seed: int) -> Tuple[List[Note], Optional[List[Note]], bytes, str]:
+    """Generate melody, optional harmony, MIDI bytes and the morse string; cached so reruns with the same inputs are free"""
+    # A private generator keeps concurrent sessions from sharing the global random state
+    rng = random.Random(seed)
+    key = MusicKey[key_name]
+    style = MusicStyle[style_name]
+    
+    melody_gen = IntelligentMelodyGenerator(key, style, rng)
+    melody_notes = melody_gen.generate_melody(message)
+    
+    # Generate harmony if requested
+    harmony_notes = None
+    if add_harmony:
+        harmony_gen = ChordProgressionGenerator(key, style, rng)
+        harmony_notes = harmony_gen.generate_harmony(melody_gen.total_duration)
+    
+    midi_data = create_midi_file(melody_notes, harmony_notes)
+    return melody_notes, harmony_notes, midi_data, melody_gen.last_morse_string
+
+@st.cache_data(max_entries=16, ttl=3600, show_spinner=False)
+def _build_package(message: str, key_name: str, style_name: str, add_harmony: bool, seed: int) -> dict:
+    """Build every download of the Create tab for one composition; cached so repeat requests skip the synth"""
+    melody_notes, harmony_notes, midi_data, morse_string = _compose_melody(
+        message, key_name, style_name, add_harmony, seed
+    )
+    key_info = MusicKey[key_name].value
+    
+    return {
+        "midi": midi_data,
+        "wav": generate_wav_from_notes(melody_notes, harmony_notes),
+        "score": generate_simple_score_text(melody_notes, message, key_info),
+        "svg": generate_svg_sheet_music(melody_notes, message, key_info),
+        "analysis": generate_educational_analysis(melody_notes, message, key_info, MusicStyle[style_name].value),
+        "morse": morse_string,
+        "melody_notes": len(melody_notes),
+        "harmony_notes": len(harmony_notes) if harmony_notes else 0,
+    }
+
+def generate_svg_sheet_music(melody_notes: List[Note], message: str, key_info: KeyInfo) -> str:
     """Generate simple SVG sheet music"""
     
     # SVG dimensions
@@ -741,47 +941,50 @@ def generate_svg_sheet_music(melody_notes: List[Note], message: str, key_info: d
     height = 400
     staff_top = 100
     staff_spacing = 15
+    upper_message = message.upper()
     
-    svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+    parts = [f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
     <!-- Background -->
     <rect width="{width}" height="{height}" fill="white" stroke="black" stroke-width="2"/>
     
     <!-- Title -->
     <text x="{width//2}" y="30" text-anchor="middle" font-family="Arial, sans-serif" font-size="18" font-weight="bold">
-        🎵 Morse Code Melody: {message.upper()}
+        🎵 Morse Code Melody: {upper_message}
     </text>
     <text x="{width//2}" y="50" text-anchor="middle" font-family="Arial, sans-serif" font-size="12" fill="#666">
-        Key: {key_info.get('name', 'C Major')} | 🔴 = Dots (.) | 🔵 = Dashes (-)
+        Key: {key_info.name} | 🔴 = Dots (.) | 🔵 = Dashes (-)
     </text>
     
-    <!-- Staff lines -->'''
+    <!-- Staff lines -->''']
     
     # Draw 5 staff lines
-    for i in range(5):
-        y = staff_top + i * staff_spacing
-        svg_content += f'\n    <line x1="50" y1="{y}" x2="{width-50}" y2="{y}" stroke="black" stroke-width="1"/>'
+    parts.extend(f'\n    <line x1="50" y1="{y}" x2="{width-50}" y2="{y}" stroke="black" stroke-width="1"/>'
+                 for y in range(staff_top, staff_top + 5 * staff_spacing, staff_spacing))
     
     # Add treble clef (simplified)
-    svg_content += f'\n    <text x="70" y="{staff_top + 2*staff_spacing + 5}" font-family="serif" font-size="40" fill="black">𝄞</text>'
+    parts.append(f'\n    <text x="70" y="{staff_top + 2*staff_spacing + 5}" font-family="serif" font-size="40" fill="black">𝄞</text>')
     
     # Convert message to morse for reference
-    morse_sequence = []
-    for char in message.upper():
-        if char in MORSE_CODE:
-            morse_sequence.extend(list(MORSE_CODE[char]))
-            morse_sequence.append(' ')
-        elif char == ' ':
-            morse_sequence.append('/')
+    morse_sequence = text_to_morse_sequence(message)
+    
+    # Every ledger line position, nearest the staff first (the MIDI range spans 64 staff spaces)
+    staff_bottom = staff_top + 4 * staff_spacing
+    above_ledgers = [staff_top - line_num * staff_spacing for line_num in range(1, 65)]
+    below_ledgers = [staff_bottom + line_num * staff_spacing for line_num in range(1, 65)]
+    
+    # Staff geometry shared by every note (middle C = line 2)
+    midi_60_position = staff_top + 2 * staff_spacing  # Middle C position
+    semitone_spacing = staff_spacing / 2
+    annotation_y = staff_top - 10
+    name_y = staff_top + 5 * staff_spacing + 20
     
     # Draw notes
     x_pos = 120
     morse_index = 0
     
     for i, note in enumerate(melody_notes[:16]):  # Limit to 16 notes for readability
-        # Calculate staff position (middle C = line 2)
-        midi_60_position = staff_top + 2 * staff_spacing  # Middle C position
-        semitone_spacing = staff_spacing / 2
+        # Calculate staff position
         note_y = midi_60_position - (note.pitch - 60) * semitone_spacing
         
         # Determine note type and color
@@ -793,33 +996,29 @@ def generate_svg_sheet_music(melody_notes: List[Note], message: str, key_info: d
             color = "#4ECDC4"  # Blue
         
         # Draw note
-        svg_content += f'\n    <text x="{x_pos}" y="{note_y + 5}" text-anchor="middle" font-family="serif" font-size="24" fill="{color}">{note_symbol}</text>'
+        parts.append(f'\n    <text x="{x_pos}" y="{note_y + 5}" text-anchor="middle" font-family="serif" font-size="24" fill="{color}">{note_symbol}</text>')
         
         # Add morse code annotation
         if morse_index < len(morse_sequence) and morse_sequence[morse_index] in '.-':
             morse_char = morse_sequence[morse_index]
-            svg_content += f'\n    <text x="{x_pos}" y="{staff_top - 10}" text-anchor="middle" font-family="Arial" font-size="14" font-weight="bold" fill="{color}">{morse_char}</text>'
+            parts.append(f'\n    <text x="{x_pos}" y="{annotation_y}" text-anchor="middle" font-family="Arial" font-size="14" font-weight="bold" fill="{color}">{morse_char}</text>')
             morse_index += 1
         elif morse_index < len(morse_sequence):
             morse_index += 1
         
         # Add note name below staff
         note_name = get_note_name_simple(note.pitch)
-        svg_content += f'\n    <text x="{x_pos}" y="{staff_top + 5*staff_spacing + 20}" text-anchor="middle" font-family="Arial" font-size="10" fill="#666">{note_name}</text>'
+        parts.append(f'\n    <text x="{x_pos}" y="{name_y}" text-anchor="middle" font-family="Arial" font-size="10" fill="#666">{note_name}</text>')
         
-        # Add ledger lines if needed
+        # Add ledger lines if needed: the leading run of lines that reaches the note
         if note_y < staff_top:  # Above staff
-            ledger_lines_needed = int((staff_top - note_y) // staff_spacing) + 1
-            for line_num in range(1, ledger_lines_needed + 1):
-                ledger_y = staff_top - line_num * staff_spacing
-                if ledger_y >= note_y - 5:
-                    svg_content += f'\n    <line x1="{x_pos - 15}" y1="{ledger_y}" x2="{x_pos + 15}" y2="{ledger_y}" stroke="black" stroke-width="1"/>'
-        elif note_y > staff_top + 4 * staff_spacing:  # Below staff
-            ledger_lines_needed = int((note_y - (staff_top + 4 * staff_spacing)) // staff_spacing) + 1
-            for line_num in range(1, ledger_lines_needed + 1):
-                ledger_y = staff_top + 4 * staff_spacing + line_num * staff_spacing
-                if ledger_y <= note_y + 5:
-                    svg_content += f'\n    <line x1="{x_pos - 15}" y1="{ledger_y}" x2="{x_pos + 15}" y2="{ledger_y}" stroke="black" stroke-width="1"/>'
+            ledger_ys = takewhile(lambda ledger_y: ledger_y >= note_y - 5, above_ledgers)
+        elif note_y > staff_bottom:  # Below staff
+            ledger_ys = takewhile(lambda ledger_y: ledger_y <= note_y + 5, below_ledgers)
+        else:
+            ledger_ys = ()
+        parts.extend(f'\n    <line x1="{x_pos - 15}" y1="{ledger_y}" x2="{x_pos + 15}" y2="{ledger_y}" stroke="black" stroke-width="1"/>'
+                     for ledger_y in ledger_ys)
         
         x_pos += 40
         
@@ -828,8 +1027,8 @@ def generate_svg_sheet_music(melody_notes: List[Note], message: str, key_info: d
             break
     
     # Add morse code reference at bottom
-    full_morse = " ".join(MORSE_CODE.get(c.upper(), '') for c in message if c.upper() in MORSE_CODE)
-    svg_content += f'''
+    full_morse = " ".join(MORSE_CODE[c] for c in upper_message if c in MORSE_CODE)
+    parts.append(f'''
     
     <!-- Morse code reference -->
     <text x="50" y="{height - 40}" font-family="Arial, sans-serif" font-size="12" fill="#333">
@@ -838,31 +1037,49 @@ def generate_svg_sheet_music(melody_notes: List[Note], message: str, key_info: d
     <text x="50" y="{height - 20}" font-family="Arial, sans-serif" font-size="10" fill="#666">
         Generated by Intelligent Morse Melody Studio - Music Education Tool
     </text>
-</svg>'''
+</svg>''')
     
-    return svg_content
+    return ''.join(parts)
+
+# Static footer of the text score
+_SCORE_FOOTER_TEXT = """
+🎓 EDUCATIONAL NOTES:
+==================
+This melody encodes your secret message using Morse code timing!
+Each letter becomes a unique musical phrase.
+
+🔍 ANALYSIS QUESTIONS:
+- Which letters create interesting rhythms?
+- How do dots vs dashes affect the melody?
+- What happens when you change the musical key?
+
+Generated by Intelligent Morse Melody Studio
+Perfect for Music Education!
+"""
 
-def generate_simple_score_text(melody_notes: List[Note], message: str, key_info: dict) -> str:
+def generate_simple_score_text(melody_notes: List[Note], message: str, key_info: KeyInfo) -> str:
     """Generate a simple text-based musical score for educational purposes"""
     
-    score_text = f"""
-🎼 MUSICAL SCORE: {message.upper()}
+    # Pitch extremes, found once for the summary below
+    pitches = [note.pitch for note in melody_notes]
+    highest, lowest = max(pitches), min(pitches)
+    upper_message = message.upper()
+    
+    parts = [f"""
+🎼 MUSICAL SCORE: {upper_message}
 {'=' * 50}
 
-🎹 Key: {key_info.get('name', 'C Major')}
-🎵 Secret Message: {message.upper()}
+🎹 Key: {key_info.name}
+🎵 Secret Message: {upper_message}
 
 📝 MORSE CODE TO MUSIC MAPPING:
 {'-' * 30}
-"""
+"""]
     
     # Add morse code breakdown
-    for char in message.upper():
-        if char in MORSE_CODE and char != ' ':
-            morse_pattern = MORSE_CODE[char]
-            score_text += f"Letter '{char}': {morse_pattern}\n"
+    parts.extend(f"Letter '{char}': {morse_pattern}\n" for char, morse_pattern in _iter_morse_letters(message))
     
-    score_text += f"""
+    parts.append(f"""
 🎼 MUSICAL NOTATION GUIDE:
 {'-' * 25}
 • Short notes (♪) = DOTS (.)
@@ -872,225 +1089,185 @@ def generate_simple_score_text(melody_notes: List[Note], message: str, key_info:
 📊 MELODY ANALYSIS:
 {'-' * 18}
 • Total Notes: {len(melody_notes)}
-• Highest Note: MIDI {max(note.pitch for note in melody_notes)}
-• Lowest Note: MIDI {min(note.pitch for note in melody_notes)}
-• Note Range: {max(note.pitch for note in melody_notes) - min(note.pitch for note in melody_notes)} semitones
+• Highest Note: MIDI {highest}
+• Lowest Note: MIDI {lowest}
+• Note Range: {highest - lowest} semitones
 
 🎵 NOTE SEQUENCE:
 {'-' * 16}
-"""
+""")
     
     # Add simplified note representation
     for i, note in enumerate(melody_notes[:20]):  # First 20 notes
         duration_symbol = "♪" if note.duration <= 0.3 else "♩"
         note_name = get_note_name_simple(note.pitch)
-        score_text += f"{i+1:2d}. {duration_symbol} {note_name} (MIDI {note.pitch})\n"
+        parts.append(f"{i+1:2d}. {duration_symbol} {note_name} (MIDI {note.pitch})\n")
     
     if len(melody_notes) > 20:
-        score_text += f"... and {len(melody_notes) - 20} more notes\n"
+        parts.append(f"... and {len(melody_notes) - 20} more notes\n")
     
-    score_text += """
-🎓 EDUCATIONAL NOTES:
-==================
-This melody encodes your secret message using Morse code timing!
-Each letter becomes a unique musical phrase.
-
-🔍 ANALYSIS QUESTIONS:
-- Which letters create interesting rhythms?
-- How do dots vs dashes affect the melody?
-- What happens when you change the musical key?
-
-Generated by Intelligent Morse Melody Studio
-Perfect for Music Education!
-"""
+    parts.append(_SCORE_FOOTER_TEXT)
     
-    return score_text
+    return ''.join(parts)
+
+# Name with octave of every MIDI note number, e.g. 60 -> "C4"
+_NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+_MIDI_NAMES = tuple(f"{_NOTE_NAMES[midi_note % 12]}{(midi_note // 12) - 1}" for midi_note in range(128))
 
 def get_note_name_simple(midi_note):
     """Simple note name with octave"""
-    note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-    octave = (midi_note // 12) - 1
-    note = note_names[midi_note % 12]
-    return f"{note}{octave}"
+    return _MIDI_NAMES[midi_note]
+
+def _classify_morse_timing(starts, durations, dot_threshold):
+    """Classify notes as dots/dashes and the gaps before them as letter/word breaks"""
+    # Gap before each note, measured from the end of the previous one
+    previous_ends = np.zeros_like(starts)
+    previous_ends[1:] = starts[:-1] + durations[:-1]
+    gaps = starts - previous_ends
+    
+    # Same integer tick thresholds as the loop version below
+    word_gap_threshold = dot_threshold * 3
+    symbols = (durations > dot_threshold * 2).astype(np.int64)  # 0 = dot, 1 = dash
+    breaks = np.where(gaps > word_gap_threshold, 2, (gaps * 2 > word_gap_threshold).astype(np.int64))
+    breaks[:1] = 0  # The first note never gets a separator in front of it
+    return symbols, breaks
+
+def _classify_morse_timing_loops(starts, durations, dot_threshold):
+    """Note-by-note _classify_morse_timing; compiled, it needs no temporary arrays"""
+    count = len(starts)
+    symbols = np.zeros(count, dtype=np.int64)  # 0 = dot, 1 = dash
+    breaks = np.zeros(count, dtype=np.int64)   # 0 = none, 1 = letter gap, 2 = word gap
+    last_end_time = 0
+    
+    # Integer tick thresholds; a letter gap (> 1.5 dots) is tested on the doubled gap
+    dash_threshold = dot_threshold * 2
+    word_gap_threshold = dot_threshold * 3
+    
+    for i in range(count):
+        gap = starts[i] - last_end_time
+        
+        # The first note never gets a separator in front of it
+        if i > 0:
+            if gap > word_gap_threshold:  # Word gap
+                breaks[i] = 2
+            elif gap * 2 > word_gap_threshold:  # Letter gap
+                breaks[i] = 1
+        
+        if durations[i] > dash_threshold:
+            symbols[i] = 1
+        
+        last_end_time = starts[i] + durations[i]
+    
+    return symbols, breaks
+
+if njit is not None:
+    _classify_morse_timing = njit(cache=True)(_classify_morse_timing_loops)
+
+def _pair_note_events(ticks: np.ndarray, pitches: np.ndarray, is_on: np.ndarray) -> np.ndarray:
+    """Pair note-offs with note-ons into (start, duration, pitch) rows sorted by start tick"""
+    # Walk each pitch's events in track order; an off closes a note only when the
+    # event before it on that pitch was an on (a repeated on restarts the note)
+    order = np.argsort(pitches, kind='stable')
+    previous, current = order[:-1], order[1:]
+    closes = (pitches[previous] == pitches[current]) & is_on[previous] & ~is_on[current]
+    
+    on_events, off_events = previous[closes], current[closes]
+    
+    # Put notes in the order they end, then sort by start, as a sequential pass would
+    by_end = np.argsort(off_events)
+    on_events, off_events = on_events[by_end], off_events[by_end]
+    start_ticks = ticks[on_events]
+    rows = np.column_stack((start_ticks, ticks[off_events] - start_ticks, pitches[on_events])).astype(np.int64)
+    return rows[np.argsort(start_ticks, kind='stable')]
 
 def decode_midi_to_morse(midi_file_bytes) -> Tuple[str, str, float]:
     """Decode a MIDI file back to morse code and text"""
     try:
-        # Create temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.mid', delete=False) as tmp_file:
-            tmp_file.write(midi_file_bytes)
-            tmp_file_path = tmp_file.name
-        
-        # Load MIDI file
-        mid = mido.MidiFile(tmp_file_path)
-        
-        # Extract notes from the melody track (track 0)
-        notes = []
-        current_time = 0
+        # Parse the MIDI file straight from memory
+        mid = mido.MidiFile(file=io.BytesIO(midi_file_bytes))
         
+        # Extract notes from the first track that has any
+        note_array = np.zeros((0, 3), dtype=np.int64)
         for track in mid.tracks:
-            current_time = 0
-            note_events = []
-            
-            for msg in track:
-                current_time += msg.time
-                if msg.type == 'note_on' and msg.velocity > 0:
-                    note_events.append(('on', current_time, msg.note))
-                elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
-                    note_events.append(('off', current_time, msg.note))
+            # Absolute tick of every message, then the note events among them
+            ticks = np.cumsum([msg.time for msg in track], dtype=np.int64)
+            note_events = [(index, msg.note, msg.type == 'note_on' and msg.velocity > 0)
+                           for index, msg in enumerate(track)
+                           if msg.type == 'note_on' or msg.type == 'note_off']
+            if not note_events:
+                continue
             
             # Process note events to get durations
-            active_notes = {}
-            for event_type, time, note in note_events:
-                if event_type == 'on':
-                    active_notes[note] = time
-                elif event_type == 'off' and note in active_notes:
-                    start_time = active_notes[note]
-                    duration = time - start_time
-                    notes.append((start_time, duration, note))
-                    del active_notes[note]
+            indices, pitches, is_on = (np.array(column) for column in zip(*note_events))
+            note_array = _pair_note_events(ticks[indices], pitches, is_on)
             
             # If we found notes, use this track
-            if notes:
+            if len(note_array):
                 break
         
-        if not notes:
+        if not len(note_array):
             return "", "No notes found in MIDI file", 0.0
         
-        # Sort notes by start time
-        notes.sort(key=lambda x: x[0])
-        
-        # Analyze timing to determine dots and dashes
-        durations = [duration for _, duration, _ in notes]
-        if len(durations) < 2:
+        # Bail out before analyzing when there is nothing to compare against
+        if len(note_array) < 2:
             return "", "Not enough notes to analyze", 0.0
         
-        # Find threshold between dots and dashes
-        sorted_durations = sorted(durations)
-        threshold_index = len(sorted_durations) // 3
-        dot_threshold = sorted_durations[threshold_index] if threshold_index < len(sorted_durations) else sorted_durations[0]
+        starts = note_array[:, 0]
+        durations = note_array[:, 1]
         
-        # Convert to morse symbols
-        morse_symbols = []
-        last_end_time = 0
+        # Analyze timing to determine dots and dashes
+        # Find threshold between dots and dashes: the lower-third duration, selected without a full sort
+        threshold_index = len(durations) // 3
+        dot_threshold = int(np.partition(durations, threshold_index)[threshold_index])
         
-        for start_time, duration, note in notes:
-            # Check for gaps (letter/word separators)
-            gap = start_time - last_end_time
-            
-            if gap > dot_threshold * 3:  # Word gap
-                if morse_symbols and morse_symbols[-1] != '/':
-                    morse_symbols.append('/')
-            elif gap > dot_threshold * 1.5:  # Letter gap
-                if morse_symbols and morse_symbols[-1] not in [' ', '/']:
-                    morse_symbols.append(' ')
-            
-            # Determine if dot or dash
-            if duration <= dot_threshold * 2:
-                morse_symbols.append('.')
-            else:
-                morse_symbols.append('-')
-            
-            last_end_time = start_time + duration
+        # Convert to morse symbols
+        symbols, breaks = _classify_morse_timing(starts, durations, dot_threshold)
         
         # Convert morse symbols to display string
-        morse_display = ''.join(morse_symbols)
+        separators = np.array(['', ' ', '/'])[breaks]
+        marks = np.where(symbols == 1, '-', '.')
+        morse_display = ''.join(np.char.add(separators, marks))
+        morse_symbols = morse_display
         
-        # Convert morse to text
+        # Convert morse to text, packing each letter's symbols into a MORSE_LUT index
         decoded_text = ""
-        current_letter = ""
+        letter_code = 1
+        lut_size = len(MORSE_LUT)
         
         for symbol in morse_symbols:
             if symbol == '.':
-                current_letter += '.'
+                letter_code <<= 1
             elif symbol == '-':
-                current_letter += '-'
-            elif symbol == ' ':
-                if current_letter:
-                    # Find letter for this morse pattern
-                    for letter, pattern in MORSE_CODE.items():
-                        if pattern == current_letter:
-                            decoded_text += letter
-                            break
-                    else:
-                        decoded_text += '?'
-                    current_letter = ""
-            elif symbol == '/':
-                if current_letter:
-                    # Process last letter before word break
-                    for letter, pattern in MORSE_CODE.items():
-                        if pattern == current_letter:
-                            decoded_text += letter
-                            break
-                    else:
-                        decoded_text += '?'
-                    current_letter = ""
-                decoded_text += ' '
+                letter_code = (letter_code << 1) | 1
+            else:
+                # Letter or word gap ends the current letter
+                if letter_code > 1:
+                    decoded_text += chr(MORSE_LUT[letter_code]) if letter_code < lut_size else '?'
+                    letter_code = 1
+                if symbol == '/':
+                    decoded_text += ' '
         
         # Process final letter
-        if current_letter:
-            for letter, pattern in MORSE_CODE.items():
-                if pattern == current_letter:
-                    decoded_text += letter
-                    break
-            else:
-                decoded_text += '?'
+        if letter_code > 1:
+            decoded_text += chr(MORSE_LUT[letter_code]) if letter_code < lut_size else '?'
         
         # Calculate confidence score
         total_chars = len([c for c in decoded_text if c != ' '])
         unknown_chars = decoded_text.count('?')
         confidence = ((total_chars - unknown_chars) / max(total_chars, 1)) * 100 if total_chars > 0 else 0
         
-        # Clean up temp file
-        try:
-            os.unlink(tmp_file_path)
-        except:
-            pass
-        
         return morse_display, decoded_text.strip(), confidence
         
     except Exception as e:
         return "", f"Error decoding MIDI: {str(e)}", 0.0
 
-def generate_educational_analysis(melody_notes: List[Note], message: str, key_info: dict, style_info: dict) -> str:
-    """Generate educational analysis of the melody for music students"""
-    
-    analysis = f"""🎓 EDUCATIONAL ANALYSIS: Morse Code Melody
-===========================================
-
-📝 SECRET MESSAGE: {message.upper()}
-🎼 MUSICAL SETTINGS: {key_info.get('name', 'Unknown')} - {style_info.get('name', 'Unknown')} Style
-
-📊 MUSICAL ANALYSIS:
--------------------
-• Total Notes: {len(melody_notes)}
-• Note Range: {max(note.pitch for note in melody_notes) - min(note.pitch for note in melody_notes)} semitones
-• Highest Note: {get_note_name_simple(max(note.pitch for note in melody_notes))}
-• Lowest Note: {get_note_name_simple(min(note.pitch for note in melody_notes))}
+@st.cache_data(max_entries=16, show_spinner=False)
+def _decode_midi_cached(midi_hash: str, _midi_file_bytes: bytes) -> Tuple[str, str, float]:
+    """Decode an uploaded MIDI file once and reuse the result on later reruns (keyed by content hash)"""
+    return decode_midi_to_morse(_midi_file_bytes)
 
-🔤 MORSE TO MUSIC MAPPING:
--------------------------
-"""
-    
-    # Add letter-by-letter analysis
-    for char in message.upper():
-        if char in MORSE_CODE and char != ' ':
-            morse_pattern = MORSE_CODE[char]
-            analysis += f"• Letter '{char}' = {morse_pattern}\n"
-            
-            # Count dots and dashes
-            dots = morse_pattern.count('.')
-            dashes = morse_pattern.count('-')
-            
-            if dots > dashes:
-                analysis += f"  → More DOTS = Faster, lighter rhythm\n"
-            elif dashes > dots:
-                analysis += f"  → More DASHES = Slower, heavier rhythm\n"
-            else:
-                analysis += f"  → Balanced rhythm\n"
-    
-    analysis += f"""
+# Static closing sections of the educational analysis, identical for every melody
+_ANALYSIS_GUIDE_TEXT = """
 🎵 COMPOSITION TECHNIQUES:
 ------------------------
 • DOTS (.) become short notes (eighth notes ♪)
@@ -1252,146 +1429,166 @@ secret message tool, but a complete musical-educational platform!
 Generated by Intelligent Morse Melody Studio
 Perfect for Music Education & Creative Exploration!
 """
+
+def generate_educational_analysis(melody_notes: List[Note], message: str, key_info: KeyInfo, style_info: StyleInfo) -> str:
+    """Generate educational analysis of the melody for music students"""
     
-    return analysis
-    """Decode a MIDI file back to morse code and text"""
-    try:
-        # Create temporary file
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix='.mid', delete=False) as tmp_file:
-            tmp_file.write(midi_file_bytes)
-            tmp_file_path = tmp_file.name
-        
-        # Load MIDI file
-        mid = mido.MidiFile(tmp_file_path)
-        
-        # Extract notes from the melody track (track 0)
-        notes = []
-        current_time = 0
-        
-        for track in mid.tracks:
-            current_time = 0
-            note_events = []
-            
-            for msg in track:
-                current_time += msg.time
-                if msg.type == 'note_on' and msg.velocity > 0:
-                    note_events.append(('on', current_time, msg.note))
-                elif msg.type == 'note_off' or (msg.type == 'note_on' and msg.velocity == 0):
-                    note_events.append(('off', current_time, msg.note))
-            
-            # Process note events to get durations
-            active_notes = {}
-            for event_type, time, note in note_events:
-                if event_type == 'on':
-                    active_notes[note] = time
-                elif event_type == 'off' and note in active_notes:
-                    start_time = active_notes[note]
-                    duration = time - start_time
-                    notes.append((start_time, duration, note))
-                    del active_notes[note]
-            
-            # If we found notes, use this track
-            if notes:
-                break
-        
-        if not notes:
-            return "", "No notes found in MIDI file", 0.0
-        
-        # Sort notes by start time
-        notes.sort(key=lambda x: x[0])
-        
-        # Analyze timing to determine dots and dashes
-        durations = [duration for _, duration, _ in notes]
-        if len(durations) < 2:
-            return "", "Not enough notes to analyze", 0.0
-        
-        # Find threshold between dots and dashes
-        sorted_durations = sorted(durations)
-        threshold_index = len(sorted_durations) // 3
-        dot_threshold = sorted_durations[threshold_index] if threshold_index < len(sorted_durations) else sorted_durations[0]
-        
-        # Convert to morse symbols
-        morse_symbols = []
-        last_end_time = 0
-        
-        for start_time, duration, note in notes:
-            # Check for gaps (letter/word separators)
-            gap = start_time - last_end_time
-            
-            if gap > dot_threshold * 3:  # Word gap
-                if morse_symbols and morse_symbols[-1] != '/':
-                    morse_symbols.append('/')
-            elif gap > dot_threshold * 1.5:  # Letter gap
-                if morse_symbols and morse_symbols[-1] not in [' ', '/']:
-                    morse_symbols.append(' ')
-            
-            # Determine if dot or dash
-            if duration <= dot_threshold * 2:
-                morse_symbols.append('.')
-            else:
-                morse_symbols.append('-')
-            
-            last_end_time = start_time + duration
-        
-        # Convert morse symbols to display string
-        morse_display = ''.join(morse_symbols)
-        
-        # Convert morse to text
-        decoded_text = ""
-        current_letter = ""
-        
-        for symbol in morse_symbols:
-            if symbol == '.':
-                current_letter += '.'
-            elif symbol == '-':
-                current_letter += '-'
-            elif symbol == ' ':
-                if current_letter:
-                    # Find letter for this morse pattern
-                    for letter, pattern in MORSE_CODE.items():
-                        if pattern == current_letter:
-                            decoded_text += letter
-                            break
-                    else:
-                        decoded_text += '?'
-                    current_letter = ""
-            elif symbol == '/':
-                if current_letter:
-                    # Process last letter before word break
-                    for letter, pattern in MORSE_CODE.items():
-                        if pattern == current_letter:
-                            decoded_text += letter
-                            break
-                    else:
-                        decoded_text += '?'
-                    current_letter = ""
-                decoded_text += ' '
-        
-        # Process final letter
-        if current_letter:
-            for letter, pattern in MORSE_CODE.items():
-                if pattern == current_letter:
-                    decoded_text += letter
-                    break
-            else:
-                decoded_text += '?'
-        
-        # Calculate confidence score
-        total_chars = len([c for c in decoded_text if c != ' '])
-        unknown_chars = decoded_text.count('?')
-        confidence = ((total_chars - unknown_chars) / max(total_chars, 1)) * 100 if total_chars > 0 else 0
-        
-        # Clean up temp file
-        try:
-            os.unlink(tmp_file_path)
-        except:
-            pass
+    # Pitch extremes, found once for the summary below
+    pitches = [note.pitch for note in melody_notes]
+    highest, lowest = max(pitches), min(pitches)
+    upper_message = message.upper()
+    
+    parts = [f"""🎓 EDUCATIONAL ANALYSIS: Morse Code Melody
+===========================================
+
+📝 SECRET MESSAGE: {upper_message}
+🎼 MUSICAL SETTINGS: {key_info.name} - {style_info.name} Style
+
+📊 MUSICAL ANALYSIS:
+-------------------
+• Total Notes: {len(melody_notes)}
+• Note Range: {highest - lowest} semitones
+• Highest Note: {get_note_name_simple(highest)}
+• Lowest Note: {get_note_name_simple(lowest)}
+
+🔤 MORSE TO MUSIC MAPPING:
+-------------------------
+"""]
+    
+    # Add letter-by-letter analysis
+    for char, morse_pattern in _iter_morse_letters(message):
+        parts.append(f"• Letter '{char}' = {morse_pattern}\n")
         
-        return morse_display, decoded_text.strip(), confidence
+        # Count dots and dashes
+        dots = morse_pattern.count('.')
+        dashes = morse_pattern.count('-')
         
-    except Exception as e:
-        return "", f"Error decoding MIDI: {str(e)}", 0.0
+        if dots > dashes:
+            parts.append("  → More DOTS = Faster, lighter rhythm\n")
+        elif dashes > dots:
+            parts.append("  → More DASHES = Slower, heavier rhythm\n")
+        else:
+            parts.append("  → Balanced rhythm\n")
+    
+    parts.append(_ANALYSIS_GUIDE_TEXT)
+    
+    return ''.join(parts)
+
+# Static help text for the Create and Decode tabs
+_CREATE_HOW_IT_WORKS_MD = """
+**🎵 How it works:**
+
+🎯 Each letter becomes a unique musical phrase  
+🎨 Advanced AI creates beautiful, flowing melodies  
+🎼 Different keys and styles create completely different sounds  
+🔄 Every generation is unique and musical  
+
+**🎹 Try different combinations:**
+- Classical + C Major = Traditional  
+- Jazz + A Minor = Sophisticated  
+- Celtic + G Major = Folk-like  
+- Ambient + C Pentatonic = Dreamy
+"""
+
+_DECODE_LOW_CONFIDENCE_MD = """
+**Low confidence may be due to:**
+- MIDI file not created by this tool
+- Non-standard timing patterns
+- File corruption or modification
+- Complex musical arrangements
+"""
+
+_DECODE_FAILURE_MD = """
+**Possible reasons:**
+- File was not created by this Morse Melody tool
+- File is corrupted or incomplete
+- MIDI format is not supported
+- File contains no recognizable morse patterns
+
+**💡 Tip:** This decoder works best with MIDI files created by this application.
+"""
+
+_DECODE_INSTRUCTIONS_MD = """
+**📋 How to use the decoder:**
+
+1. **Upload a MIDI file** created by this application
+2. **Click "Decode Hidden Message"** to analyze the file
+3. **View the results** including the original text and morse code
+4. **Check the confidence score** to see how accurate the decode is
+
+**✅ Best results with:**
+- MIDI files created by this tool
+- Files that haven't been modified
+- Simple melodies without complex arrangements
+
+**🎵 Try it:** Create a melody in the first tab, download it, then upload it here to test the decoder!
+"""
+
+# Static sidebar content, built once at import instead of on every rerun
+_SIDEBAR_ABOUT_MD = """
+**🧠 Intelligent Melody Generation**
+
+This tool uses advanced musical AI to create genuinely beautiful melodies that encode your secret messages.
+
+**✨ Key Features:**
+- Real musical intelligence
+- Natural phrase contours
+- Style-aware generation
+- Intelligent interval selection
+- Harmonic awareness
+
+**🎼 Musical Styles:**
+- **Classical:** Traditional, elegant arcs
+- **Folk:** Simple, memorable patterns  
+- **Jazz:** Sophisticated, unexpected
+- **Celtic:** Flowing, modal sounds
+- **Ambient:** Gentle, floating phrases
+
+**🎹 Different Every Time:**
+Each generation creates a unique melody, even for the same text. The AI considers musical context, phrase structure, and style to create genuinely musical results.
+"""
+
+_SIDEBAR_HOW_IT_WORKS_MD = """
+**🎯 Musical Intelligence:**
+1. Converts your text to Morse code
+2. Creates natural phrase arcs
+3. Chooses notes using music theory
+4. Avoids repetitive patterns
+5. Generates complementary harmony
+
+**🎨 Each style has:**
+- Unique interval preferences
+- Different phrase contours
+- Style-specific chord progressions
+- Appropriate tempo and dynamics
+"""
+
+_SIDEBAR_TIPS_MD = """
+**For Best Results:**
+- Try the same message in different keys
+- Experiment with various styles
+- Use shorter messages for clarity
+- Enable harmony for richer sound
+
+**🎵 Musical Tip:**
+The same message sounds completely different in each key and style - try them all!
+"""
+
+# Quick example buttons: (label, message, key, style)
+_QUICK_EXAMPLES = (
+    ("🌟 'Hope' in C Major Classical", 'Hope', MusicKey.C_MAJOR, MusicStyle.CLASSICAL),
+    ("🎸 'Love' in G Major Folk", 'Love', MusicKey.G_MAJOR, MusicStyle.FOLK),
+    ("🎺 'Jazz' in A Minor Jazz", 'Jazz', MusicKey.A_MINOR, MusicStyle.JAZZ),
+    ("🌙 'Dream' in C Pentatonic Ambient", 'Dream', MusicKey.C_PENTATONIC, MusicStyle.AMBIENT),
+)
+
+def _apply_quick_example(message: str, key: MusicKey, style: MusicStyle) -> None:
+    """Store a quick example's settings in session state (button callback)"""
+    st.session_state.update({
+        'message': message,
+        'key': key,
+        'style': style
+    })
 
 def main():
     # Title and description
@@ -1424,7 +1621,7 @@ def main():
                 key = st.selectbox(
                     "Musical Key:",
                     options=list(MusicKey),
-                    format_func=lambda x: x.value["name"]
+                    format_func=lambda x: x.value.name
                 )
                 
                 add_harmony = st.checkbox("Add Harmony", value=True, help="Rich chord progressions")
@@ -1433,73 +1630,47 @@ def main():
                 style = st.selectbox(
                     "Musical Style:",
                     options=list(MusicStyle),
-                    format_func=lambda x: x.value["name"]
+                    format_func=lambda x: x.value.name
                 )
                 
                 regenerate = st.checkbox("Force New Melody", help="Generate a completely different melody for the same text")
         
         with col2:
-            st.info("""
-            **🎵 How it works:**
-            
-            🎯 Each letter becomes a unique musical phrase  
-            🎨 Advanced AI creates beautiful, flowing melodies  
-            🎼 Different keys and styles create completely different sounds  
-            🔄 Every generation is unique and musical  
-            
-            **🎹 Try different combinations:**
-            - Classical + C Major = Traditional  
-            - Jazz + A Minor = Sophisticated  
-            - Celtic + G Major = Folk-like  
-            - Ambient + C Pentatonic = Dreamy  
-            """)
+            st.info(_CREATE_HOW_IT_WORKS_MD)
         
         # Generate button
         if st.button("🎵 Generate Beautiful Melody", type="primary", use_container_width=True):
             if message.strip():
                 # Set random seed based on message and settings for consistency
-                if not regenerate:
+                if regenerate:
+                    seed = random.SystemRandom().randrange(1000000)
+                else:
+                    # crc32 is stable across processes, unlike the salted built-in hash()
                     seed_string = f"{message}{key.name}{style.name}"
-                    random.seed(hash(seed_string) % 1000000)
+                    seed = zlib.crc32(seed_string.encode())
                 
                 with st.spinner("🎼 Composing your musical masterpiece..."):
                     try:
-                        # Generate melody
-                        melody_gen = IntelligentMelodyGenerator(key, style)
-                        melody_notes = melody_gen.generate_melody(message)
-                        
-                        # Generate harmony if requested
-                        harmony_notes = None
-                        if add_harmony:
-                            harmony_gen = ChordProgressionGenerator(key, style)
-                            total_duration = max(note.start_time + note.duration for note in melody_notes)
-                            harmony_notes = harmony_gen.generate_harmony(total_duration)
-                        
-                        # Create MIDI, WAV, and educational materials
-                        midi_data = create_midi_file(melody_notes, harmony_notes)
-                        wav_data = generate_wav_from_notes(melody_notes, harmony_notes)
-                        score_text = generate_simple_score_text(melody_notes, message, key.value)
-                        svg_sheet_music = generate_svg_sheet_music(melody_notes, message, key.value)
-                        analysis_text = generate_educational_analysis(melody_notes, message, key.value, style.value)
+                        # Generate the melody and every download (cached per settings and seed)
+                        package = _build_package(message, key.name, style.name, add_harmony, seed)
+                        wav_data = package["wav"]
                         
                         # Generate a random song ID for filename
                         import time
                         song_id = f"song_{int(time.time()) % 100000:05d}"
                         
-                        # Store in session state immediately after generation
+                        # Store only a description of the song in session state; the payload
+                        # bytes stay in the shared package cache instead of a copy per session
                         st.session_state.update({
                             'melody_generated': True,
-                            'current_midi_data': midi_data,
-                            'current_wav_data': wav_data,
-                            'current_score_text': score_text,
-                            'current_svg_sheet': svg_sheet_music,
-                            'current_analysis_text': analysis_text,
+                            'current_seed': seed,
+                            'current_add_harmony': add_harmony,
                             'current_song_id': song_id,
                             'current_key_name': key.name,
                             'current_style_name': style.name,
                             'current_message': message,
-                            'current_melody_notes': len(melody_notes),
-                            'current_harmony': 'Yes' if harmony_notes else 'No'
+                            'current_melody_notes': package["melody_notes"],
+                            'current_harmony': 'Yes' if package["harmony_notes"] else 'No'
                         })
                         
                         # Success message
@@ -1508,8 +1679,9 @@ def main():
                         # WAV Audio Player
                         st.subheader("🎧 Listen to Your Melody")
                         if wav_data:
-                            audio_player_html = create_audio_player_with_wav(wav_data)
-                            st.components.v1.html(audio_player_html, height=200)
+                            # Streamlit serves the bytes from its media endpoint; no base64 page blob
+                            st.audio(wav_data, format="audio/wav")
+                            st.caption("🎵 High-Quality WAV Audio • 🎶 Stereo Sound")
                         else:
                             st.error("Could not generate audio. MIDI file is still available for download.")
                         
@@ -1520,36 +1692,27 @@ def main():
                             st.write("**📝 Your Message:**")
                             st.code(message.upper())
                             
-                            # Convert to morse for display
-                            morse_display = ""
-                            for char in message.upper():
-                                if char in MORSE_CODE:
-                                    morse_display += MORSE_CODE[char] + " "
-                                elif char == " ":
-                                    morse_display += "/ "
-                            
                             st.write("**📻 Morse Code:**")
-                            st.code(morse_display.strip())
+                            st.code(package["morse"])
                         
                         with info_col2:
-                            st.write("**🎼 Musical Details:**")
-                            st.write(f"🎹 **Key:** {key.value['name']}")
-                            st.write(f"🎨 **Style:** {style.value['name']}")
-                            st.write(f"🎵 **Notes:** {len(melody_notes)}")
-                            if harmony_notes:
-                                st.write(f"🎶 **Harmony:** {len(harmony_notes)} chord notes")
-                            else:
-                                st.write("🎶 **Harmony:** None")
+                            harmony_line = f"{package['harmony_notes']} chord notes" if package["harmony_notes"] else "None"
+                            st.markdown("  \n".join([
+                                "**🎼 Musical Details:**",
+                                f"🎹 **Key:** {key.value.name}",
+                                f"🎨 **Style:** {style.value.name}",
+                                f"🎵 **Notes:** {package['melody_notes']}",
+                                f"🎶 **Harmony:** {harmony_line}",
+                            ]))
                         
-                        # Download section - use session state data
+                        # Download section
                         st.subheader("📥 Download Your Complete Musical Package")
                         
-                        # Get data from session state (prevents regeneration on each download)
-                        midi_data = st.session_state.get('current_midi_data', b'')
-                        wav_data = st.session_state.get('current_wav_data', b'')
-                        score_text = st.session_state.get('current_score_text', '')
-                        svg_sheet = st.session_state.get('current_svg_sheet', '')
-                        analysis_text = st.session_state.get('current_analysis_text', '')
+                        # Downloads come from the cached package (prevents regeneration on each download)
+                        midi_data = package["midi"]
+                        score_text = package["score"]
+                        svg_sheet = package["svg"]
+                        analysis_text = package["analysis"]
                         song_id = st.session_state.get('current_song_id', 'unknown')
                         key_name = st.session_state.get('current_key_name', 'C_MAJOR')
                         style_name = st.session_state.get('current_style_name', 'CLASSICAL')
@@ -1618,10 +1781,10 @@ def main():
                                     key="analysis_download"
                                 )
                         
-                        # Show sheet music preview
+                        # Sheet music preview, collapsed so the iframe is only laid out on request
                         if svg_sheet:
-                            st.subheader("🎼 Sheet Music Preview")
-                            st.components.v1.html(f'<div style="text-align: center;">{svg_sheet}</div>', height=450)
+                            with st.expander("🎼 Sheet Music Preview"):
+                                st.components.v1.html(f'<div style="text-align: center;">{svg_sheet}</div>', height=450)
                         
                         # Educational insights
                         st.subheader("🎓 Educational Insights")
@@ -1640,43 +1803,13 @@ def main():
         
         # Quick examples section
         st.subheader("🎯 Quick Examples")
-        example_cols = st.columns(4)
-        
-        with example_cols[0]:
-            if st.button("🌟 'Hope' in C Major Classical", use_container_width=True):
-                st.session_state.update({
-                    'message': 'Hope',
-                    'key': MusicKey.C_MAJOR,
-                    'style': MusicStyle.CLASSICAL
-                })
-                st.rerun()
-        
-        with example_cols[1]:
-            if st.button("🎸 'Love' in G Major Folk", use_container_width=True):
-                st.session_state.update({
-                    'message': 'Love',
-                    'key': MusicKey.G_MAJOR,
-                    'style': MusicStyle.FOLK
-                })
-                st.rerun()
-        
-        with example_cols[2]:
-            if st.button("🎺 'Jazz' in A Minor Jazz", use_container_width=True):
-                st.session_state.update({
-                    'message': 'Jazz',
-                    'key': MusicKey.A_MINOR,
-                    'style': MusicStyle.JAZZ
-                })
-                st.rerun()
-        
-        with example_cols[3]:
-            if st.button("🌙 'Dream' in C Pentatonic Ambient", use_container_width=True):
-                st.session_state.update({
-                    'message': 'Dream',
-                    'key': MusicKey.C_PENTATONIC,
-                    'style': MusicStyle.AMBIENT
-                })
-                st.rerun()
+        example_cols = st.columns(len(_QUICK_EXAMPLES))
+        
+        for column, (label, example_message, example_key, example_style) in zip(example_cols, _QUICK_EXAMPLES):
+            with column:
+                # The callback runs before the rerun the click already triggers, so no st.rerun() is needed
+                st.button(label, use_container_width=True, on_click=_apply_quick_example,
+                          args=(example_message, example_key, example_style))
 
     # ---------------------- DECODE TAB ----------------------
     with tab2:
@@ -1697,11 +1830,12 @@ def main():
             if st.button("🔍 Decode Hidden Message", type="primary", use_container_width=True):
                 with st.spinner("🔬 Analyzing MIDI file and decoding message..."):
                     try:
-                        # Read uploaded file
-                        midi_bytes = uploaded_file.read()
+                        # Read uploaded file; a short digest keys the cache instead of the whole file
+                        midi_bytes = uploaded_file.getvalue()
+                        midi_hash = hashlib.blake2b(midi_bytes, digest_size=16).hexdigest()
                         
                         # Decode the MIDI file
-                        morse_code, decoded_text, confidence = decode_midi_to_morse(midi_bytes)
+                        morse_code, decoded_text, confidence = _decode_midi_cached(midi_hash, midi_bytes)
                         
                         if decoded_text and not decoded_text.startswith("Error"):
                             # Success! Display results
@@ -1728,46 +1862,47 @@ def main():
                             with result_col2:
                                 st.subheader("📊 **Analysis Details:**")
                                 
-                                # Calculate statistics
-                                total_chars = len([c for c in decoded_text if c != ' '])
-                                words = len(decoded_text.split())
-                                unknown_chars = decoded_text.count('?')
+                                # Calculate statistics in a single pass over the decoded words
+                                word_list = decoded_text.split()
+                                total_chars = 0
+                                unknown_chars = 0
+                                for word in word_list:
+                                    total_chars += len(word)
+                                    unknown_chars += word.count('?')
+                                words = len(word_list)
                                 
-                                st.metric("🔤 **Characters Decoded**", total_chars)
-                                st.metric("📝 **Words Found**", words)
-                                st.metric("❓ **Unknown Characters**", unknown_chars)
-                                st.metric("🎯 **Decode Confidence**", f"{confidence:.1f}%")
+                                # One table element instead of a metric widget per statistic
+                                st.table({"Value": {
+                                    "🔤 Characters Decoded": str(total_chars),
+                                    "📝 Words Found": str(words),
+                                    "❓ Unknown Characters": str(unknown_chars),
+                                    "🎯 Decode Confidence": f"{confidence:.1f}%",
+                                }})
                                 
                                 # Confidence explanation
                                 if confidence < 80:
-                                    st.info("""
-                                    **Low confidence may be due to:**
-                                    - MIDI file not created by this tool
-                                    - Non-standard timing patterns
-                                    - File corruption or modification
-                                    - Complex musical arrangements
-                                    """)
+                                    st.info(_DECODE_LOW_CONFIDENCE_MD)
                             
                             # Show character-by-character breakdown
                             with st.expander("🔍 **Detailed Character Analysis**"):
                                 st.write("**Character-by-character breakdown:**")
                                 
-                                words = decoded_text.split()
-                                for word_idx, word in enumerate(words):
-                                    st.write(f"**Word {word_idx + 1}:** `{word}`")
-                                    
-                                    # Show each character's morse pattern
-                                    char_cols = st.columns(min(len(word), 6))
-                                    for char_idx, char in enumerate(word):
-                                        col_idx = char_idx % 6
-                                        with char_cols[col_idx]:
-                                            if char in MORSE_CODE:
-                                                morse_pattern = MORSE_CODE[char]
-                                                st.success(f"**{char}** = `{morse_pattern}`")
-                                            elif char == '?':
-                                                st.error(f"**{char}** = `unknown`")
-                                            else:
-                                                st.info(f"**{char}** = `special`")
+                                # Describe each distinct character once; letters repeat a lot across words
+                                char_lines = {}
+                                for char in set(decoded_text.replace(' ', '')):
+                                    morse_pattern = MORSE_CODE.get(char)
+                                    if morse_pattern is not None:
+                                        char_lines[char] = f"- ✅ **{char}** = `{morse_pattern}`"
+                                    elif char == '?':
+                                        char_lines[char] = f"- ❌ **{char}** = `unknown`"
+                                    else:
+                                        char_lines[char] = f"- ℹ️ **{char}** = `special`"
+                                
+                                for word_idx, word in enumerate(word_list):
+                                    # Show each character's morse pattern, one markdown block per word
+                                    lines = [f"**Word {word_idx + 1}:** `{word}`", ""]
+                                    lines.extend(char_lines[char] for char in word)
+                                    st.markdown("\n".join(lines))
                             
                             # Play the uploaded file
                             st.subheader("🎧 **Listen to the Uploaded Melody**")
@@ -1808,15 +1943,7 @@ Decoded by Intelligent Morse Melody Studio
                             st.error("❌ **Could not decode the MIDI file**")
                             st.write(f"**Error:** {decoded_text}")
                             
-                            st.info("""
-                            **Possible reasons:**
-                            - File was not created by this Morse Melody tool
-                            - File is corrupted or incomplete
-                            - MIDI format is not supported
-                            - File contains no recognizable morse patterns
-                            
-                            **💡 Tip:** This decoder works best with MIDI files created by this application.
-                            """)
+                            st.info(_DECODE_FAILURE_MD)
                     
                     except Exception as e:
                         st.error(f"❌ **Error processing file:** {str(e)}")
@@ -1824,21 +1951,7 @@ Decoded by Intelligent Morse Melody Studio
         
         else:
             # Show instructions when no file is uploaded
-            st.info("""
-            **📋 How to use the decoder:**
-            
-            1. **Upload a MIDI file** created by this application
-            2. **Click "Decode Hidden Message"** to analyze the file
-            3. **View the results** including the original text and morse code
-            4. **Check the confidence score** to see how accurate the decode is
-            
-            **✅ Best results with:**
-            - MIDI files created by this tool
-            - Files that haven't been modified
-            - Simple melodies without complex arrangements
-            
-            **🎵 Try it:** Create a melody in the first tab, download it, then upload it here to test the decoder!
-            """)
+            st.info(_DECODE_INSTRUCTIONS_MD)
             
             # Example section
             st.subheader("🎯 **Test the Decoder**")
@@ -1849,56 +1962,13 @@ Decoded by Intelligent Morse Melody Studio
     with st.sidebar:
         st.header("🎵 About This Tool")
         
-        st.markdown("""
-        **🧠 Intelligent Melody Generation**
-        
-        This tool uses advanced musical AI to create genuinely beautiful melodies that encode your secret messages.
-        
-        **✨ Key Features:**
-        - Real musical intelligence
-        - Natural phrase contours
-        - Style-aware generation
-        - Intelligent interval selection
-        - Harmonic awareness
-        
-        **🎼 Musical Styles:**
-        - **Classical:** Traditional, elegant arcs
-        - **Folk:** Simple, memorable patterns  
-        - **Jazz:** Sophisticated, unexpected
-        - **Celtic:** Flowing, modal sounds
-        - **Ambient:** Gentle, floating phrases
-        
-        **🎹 Different Every Time:**
-        Each generation creates a unique melody, even for the same text. The AI considers musical context, phrase structure, and style to create genuinely musical results.
-        """)
+        st.markdown(_SIDEBAR_ABOUT_MD)
         
         st.header("🔍 How It Works")
-        st.markdown("""
-        **🎯 Musical Intelligence:**
-        1. Converts your text to Morse code
-        2. Creates natural phrase arcs
-        3. Chooses notes using music theory
-        4. Avoids repetitive patterns
-        5. Generates complementary harmony
-        
-        **🎨 Each style has:**
-        - Unique interval preferences
-        - Different phrase contours
-        - Style-specific chord progressions
-        - Appropriate tempo and dynamics
-        """)
+        st.markdown(_SIDEBAR_HOW_IT_WORKS_MD)
         
         st.header("💡 Tips")
-        st.markdown("""
-        **For Best Results:**
-        - Try the same message in different keys
-        - Experiment with various styles
-        - Use shorter messages for clarity
-        - Enable harmony for richer sound
-        
-        **🎵 Musical Tip:**
-        The same message sounds completely different in each key and style - try them all!
-        """)
+        st.markdown(_SIDEBAR_TIPS_MD)
 
 if __name__ == "__main__":
     main()